@@ -6,18 +6,21 @@ medicine reminder sync, and background alarm checker.
 """
 
 import asyncio
-import json
 import logging
+import queue
 import sqlite3
-from contextlib import asynccontextmanager
+from collections import defaultdict
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Set
+from typing import Optional
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+import orjson
 from pydantic import BaseModel
 
 # ---------------------------------------------------------------------------
@@ -34,23 +37,90 @@ logger = logging.getLogger("health-monitor")
 # ---------------------------------------------------------------------------
 DB_PATH = Path(__file__).resolve().parent / "health.db"
 
+READ_POOL_SIZE = 4
+
+# Applied once per connection at startup instead of on every request.
+_DB_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-20000",
+    # No in-band checkpoints: db_maintenance truncates the WAL on its
+    # own schedule so commits never stall on a surprise checkpoint.
+    "PRAGMA wal_autocheckpoint=0",
+)
+
+# One long-lived writer (guarded by writer_lock) + a small pool of readers.
+# WAL mode lets the readers run concurrently with the writer.
+writer: sqlite3.Connection | None = None
+writer_lock = asyncio.Lock()
+readers: queue.Queue = queue.Queue()
+
+# Hot-path SQL lives in module constants: sqlite3 keeps a per-connection
+# prepared-statement cache keyed by the SQL text, so passing the identical
+# string every time skips re-parsing the statement on each call.
+INSERT_VITAL_SQL = """
+    INSERT INTO vital_logs (timestamp, ts_ms, heart_rate, spo2, temp, fall_detected)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+FETCH_HISTORY_SQL = "SELECT * FROM vital_logs ORDER BY id DESC LIMIT ?"
 
-def get_db():
-    """Return a new SQLite connection (per-call for thread safety)."""
-    conn = sqlite3.connect(str(DB_PATH))
+
+def _open_connection() -> sqlite3.Connection:
+    """Open one SQLite connection with the performance pragmas applied."""
+    conn = sqlite3.connect(
+        str(DB_PATH),
+        check_same_thread=False,
+        isolation_level=None,
+        cached_statements=64,
+    )
     conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
+    for pragma in _DB_PRAGMAS:
+        conn.execute(pragma)
     return conn
 
 
+def open_db_pool():
+    """Open the single writer and the read pool (called once at startup)."""
+    global writer
+    writer = _open_connection()
+    for _ in range(READ_POOL_SIZE):
+        readers.put(_open_connection())
+    logger.info(
+        "DB pool ready: 1 writer + %d readers at %s", READ_POOL_SIZE, DB_PATH
+    )
+
+
+def close_db_pool():
+    """Close the writer and every pooled reader (called on shutdown)."""
+    global writer
+    if writer is not None:
+        writer.close()
+        writer = None
+    while not readers.empty():
+        readers.get_nowait().close()
+
+
+@contextmanager
+def reader():
+    """Borrow a read connection from the pool, returning it afterwards."""
+    conn = readers.get()
+    try:
+        yield conn
+    finally:
+        readers.put(conn)
+
+
 def init_db():
     """Create the vital_logs table if it doesn't exist."""
-    conn = get_db()
-    conn.execute(
+    writer.execute(
         """
         CREATE TABLE IF NOT EXISTS vital_logs (
             id             INTEGER PRIMARY KEY AUTOINCREMENT,
             timestamp      TEXT    NOT NULL,
+            ts_ms          INTEGER,
             heart_rate     INTEGER,
             spo2           INTEGER,
             temp           REAL,
@@ -58,46 +128,143 @@ def init_db():
         )
         """
     )
-    conn.commit()
-    conn.close()
+    _migrate_ts_ms()
+    # Covering index: the range queries in /history-summary and
+    # /report-data are satisfied from the index alone. Integer epoch-ms
+    # keys compare faster and pack tighter than the ISO text column.
+    writer.execute("DROP INDEX IF EXISTS idx_vital_ts_cover")
+    writer.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_vital_ts_ms_cover
+        ON vital_logs(ts_ms, heart_rate, spo2, temp, fall_detected)
+        """
+    )
     logger.info("Database initialized at %s", DB_PATH)
 
 
-def save_vital(data: dict):
-    """Insert one vital-data row."""
-    conn = get_db()
-    conn.execute(
-        """
-        INSERT INTO vital_logs (timestamp, heart_rate, spo2, temp, fall_detected)
-        VALUES (?, ?, ?, ?, ?)
-        """,
-        (
-            data.get("timestamp", datetime.now().isoformat()),
-            data.get("heart_rate"),
-            data.get("spo2"),
-            data.get("temp"),
-            1 if data.get("fall_detected") else 0,
-        ),
+def _migrate_ts_ms():
+    """Add and backfill the ts_ms column on databases created before it."""
+    cols = {r["name"] for r in writer.execute("PRAGMA table_info(vital_logs)")}
+    if "ts_ms" not in cols:
+        writer.execute("ALTER TABLE vital_logs ADD COLUMN ts_ms INTEGER")
+    stale = writer.execute(
+        "SELECT id, timestamp FROM vital_logs WHERE ts_ms IS NULL"
+    ).fetchall()
+    if not stale:
+        return
+    updates = []
+    for row in stale:
+        try:
+            ms = int(datetime.fromisoformat(row["timestamp"]).timestamp() * 1000)
+        except (TypeError, ValueError):
+            continue
+        updates.append((ms, row["id"]))
+    writer.executemany("UPDATE vital_logs SET ts_ms = ? WHERE id = ?", updates)
+    logger.info("Backfilled ts_ms for %d rows", len(updates))
+
+
+# Write-behind queue: the WebSocket loop only enqueues; db_writer flushes
+# batches in a single transaction, collapsing many fsyncs into one.
+DB_BATCH_MAX = 256
+DB_FLUSH_SECS = 0.1
+
+pending: asyncio.Queue = asyncio.Queue(maxsize=10_000)
+
+
+def queue_vital(data: dict):
+    """Enqueue one vital-data row for the background batch writer."""
+    ts_raw = data.get("timestamp")
+    if isinstance(ts_raw, int):
+        # Devices send epoch nanoseconds (time.time_ns()) — use directly.
+        ts_ms = ts_raw // 1_000_000
+        ts_iso = datetime.fromtimestamp(ts_ms / 1000).isoformat()
+    else:
+        try:
+            ts = datetime.fromisoformat(ts_raw) if ts_raw else datetime.now()
+        except (TypeError, ValueError):
+            ts = datetime.now()
+            ts_raw = None
+        ts_iso = ts_raw or ts.isoformat()
+        ts_ms = int(ts.timestamp() * 1000)
+    row = (
+        ts_iso,
+        ts_ms,
+        data.get("heart_rate"),
+        data.get("spo2"),
+        data.get("temp"),
+        1 if data.get("fall_detected") else 0,
     )
-    conn.commit()
-    conn.close()
+    try:
+        pending.put_nowait(row)
+    except asyncio.QueueFull:
+        logger.warning("Vital queue full — dropping reading")
+
+
+async def _flush_batch(batch: list[tuple]):
+    """Write one batch of rows in a single transaction."""
+    async with writer_lock:
+        writer.execute("BEGIN")
+        try:
+            writer.executemany(INSERT_VITAL_SQL, batch)
+            writer.execute("COMMIT")
+        except Exception:
+            writer.execute("ROLLBACK")
+            raise
+
+
+async def db_writer():
+    """Drain the pending queue, committing up to DB_BATCH_MAX rows at once."""
+    while True:
+        batch = [await pending.get()]
+        try:
+            while len(batch) < DB_BATCH_MAX:
+                batch.append(
+                    await asyncio.wait_for(pending.get(), timeout=DB_FLUSH_SECS)
+                )
+        except asyncio.TimeoutError:
+            pass
+        try:
+            await _flush_batch(batch)
+        except Exception as e:
+            logger.error("DB batch write error: %s", e)
+
+
+MAINTENANCE_INTERVAL_SECS = 900
+
+
+def _run_db_maintenance():
+    """Refresh planner stats and truncate the WAL (runs on a thread)."""
+    writer.execute("PRAGMA optimize")
+    writer.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+async def db_maintenance():
+    """Every 15 min: PRAGMA optimize + WAL checkpoint, off the event loop."""
+    while True:
+        await asyncio.sleep(MAINTENANCE_INTERVAL_SECS)
+        try:
+            async with writer_lock:
+                await asyncio.to_thread(_run_db_maintenance)
+            logger.info("DB maintenance done (optimize + WAL checkpoint)")
+        except Exception as e:
+            logger.error("DB maintenance error: %s", e)
 
 
 def fetch_history(limit: int = 10) -> list[dict]:
     """Return the last `limit` readings, newest first."""
-    conn = get_db()
-    rows = conn.execute(
-        "SELECT * FROM vital_logs ORDER BY id DESC LIMIT ?", (limit,)
-    ).fetchall()
-    conn.close()
+    with reader() as conn:
+        rows = conn.execute(FETCH_HISTORY_SQL, (limit,)).fetchall()
     return [dict(r) for r in rows]
 
 # ---------------------------------------------------------------------------
 # Medicine Reminder State (Multiple Alarms)
 # ---------------------------------------------------------------------------
 alarms: list = []           # [{"id": 1, "time": "02:30 PM", "medicine": "Dolo"}, ...]
+alarms_by_time: defaultdict = defaultdict(list)  # "hh:mm AM/PM" -> [alarm, ...]
 next_alarm_id: int = 1
-alarm_fired_set: set = set()  # tracks (alarm_id, minute_str) to avoid repeats
+alarm_fired_minute: str = ""  # minute the ids below belong to
+alarm_fired_ids: set = set()  # alarms already fired during that minute
+alarm_event = asyncio.Event()  # set on add/delete so the checker re-plans
 
 # ---------------------------------------------------------------------------
 # Fall Detection Toggle (Maintenance Mode)
@@ -116,61 +283,106 @@ class DeleteReminderRequest(BaseModel):
 # Connection Manager
 # ---------------------------------------------------------------------------
 
+# Max messages buffered per client before it is considered stalled.
+CLIENT_QUEUE_SIZE = 32
+
+# Constant payloads are serialized once at import; every broadcast then
+# reuses the same string object instead of re-encoding it per call.
+STOP_ALARM_MSG = orjson.dumps({"type": "STOP_ALARM"}).decode()
+
+
+@dataclass(eq=False)
+class Client:
+    """One WebSocket client with its outbound queue and relay task."""
+
+    ws: WebSocket
+    queue: asyncio.Queue = field(
+        default_factory=lambda: asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+    )
+    relay_task: Optional[asyncio.Task] = None
+
+
 class ConnectionManager:
-    """Keeps track of active WebSocket connections by client type."""
+    """Keeps track of active WebSocket connections by client type.
+
+    Each client gets its own bounded outbound queue drained by a relay
+    task, so broadcasts are non-blocking put_nowait calls and a slow
+    peer only ever stalls (and eventually loses) its own connection.
+    """
 
     def __init__(self):
-        self.device_connections: Set[WebSocket] = set()
-        self.frontend_connections: Set[WebSocket] = set()
+        # Keyed by id(ws): O(1) removal and stable iteration order during
+        # broadcast (insertion order = connection order).
+        self.device_clients: dict[int, Client] = {}
+        self.frontend_clients: dict[int, Client] = {}
+
+    def _registry(self, client_type: str) -> dict[int, Client]:
+        return (
+            self.device_clients if client_type == "device"
+            else self.frontend_clients
+        )
 
     async def connect(self, websocket: WebSocket, client_type: str):
         await websocket.accept()
-        if client_type == "device":
-            self.device_connections.add(websocket)
-            logger.info(
-                "Device connected. Total devices: %d", len(self.device_connections)
-            )
-        elif client_type == "frontend":
-            self.frontend_connections.add(websocket)
-            logger.info(
-                "Frontend connected. Total frontends: %d",
-                len(self.frontend_connections),
-            )
+        client = Client(ws=websocket)
+        client.relay_task = asyncio.create_task(self._relay(client))
+        self._registry(client_type)[id(websocket)] = client
+        logger.info(
+            "%s connected. Total %ss: %d",
+            client_type.capitalize(), client_type,
+            len(self._registry(client_type)),
+        )
 
     def disconnect(self, websocket: WebSocket, client_type: str):
-        if client_type == "device":
-            self.device_connections.discard(websocket)
-            logger.info(
-                "Device disconnected. Total devices: %d", len(self.device_connections)
-            )
-        elif client_type == "frontend":
-            self.frontend_connections.discard(websocket)
-            logger.info(
-                "Frontend disconnected. Total frontends: %d",
-                len(self.frontend_connections),
-            )
+        registry = self._registry(client_type)
+        client = registry.pop(id(websocket), None)
+        if client is not None and client.relay_task is not None:
+            client.relay_task.cancel()
+        logger.info(
+            "%s disconnected. Total %ss: %d",
+            client_type.capitalize(), client_type, len(registry),
+        )
+
+    @staticmethod
+    async def _relay(client: Client):
+        """Forward queued messages to one client (runs per connection)."""
+        try:
+            while True:
+                msg = await client.queue.get()
+                await client.ws.send_text(msg)
+        except Exception:
+            # Send failed — the endpoint's receive loop handles cleanup.
+            pass
+
+    async def _force_disconnect(self, client: Client, registry: dict[int, Client]):
+        """Drop a client whose queue overflowed (it fell too far behind)."""
+        registry.pop(id(client.ws), None)
+        if client.relay_task is not None:
+            client.relay_task.cancel()
+        try:
+            await client.ws.close(code=1013, reason="Client too slow")
+        except Exception:
+            pass
+        logger.warning("Dropped slow client — outbound queue overflowed")
+
+    async def _broadcast(self, registry: dict[int, Client], data: str):
+        """Queue `data` for every client; disconnect any with a full queue."""
+        stalled = []
+        for client in registry.values():
+            try:
+                client.queue.put_nowait(data)
+            except asyncio.QueueFull:
+                stalled.append(client)
+        for client in stalled:
+            await self._force_disconnect(client, registry)
 
     async def broadcast_to_frontends(self, data: str):
         """Send a message to every connected frontend client."""
-        disconnected = []
-        for conn in self.frontend_connections:
-            try:
-                await conn.send_text(data)
-            except Exception:
-                disconnected.append(conn)
-        for conn in disconnected:
-            self.frontend_connections.discard(conn)
+        await self._broadcast(self.frontend_clients, data)
 
     async def broadcast_to_devices(self, data: str):
         """Send a message to every connected device client."""
-        disconnected = []
-        for conn in self.device_connections:
-            try:
-                await conn.send_text(data)
-            except Exception:
-                disconnected.append(conn)
-        for conn in disconnected:
-            self.device_connections.discard(conn)
+        await self._broadcast(self.device_clients, data)
 
 
 manager = ConnectionManager()
@@ -179,28 +391,60 @@ manager = ConnectionManager()
 # Background Alarm Checker
 # ---------------------------------------------------------------------------
 
+def _seconds_to_next_alarm(now: datetime) -> float | None:
+    """Seconds until the earliest scheduled alarm, or None if there are none.
+
+    Alarms whose minute is already current (just fired or about to fire in
+    this pass) count as due tomorrow.
+    """
+    best = None
+    for time_str in alarms_by_time:
+        try:
+            t = datetime.strptime(time_str, "%I:%M %p")
+        except ValueError:
+            continue
+        target = now.replace(hour=t.hour, minute=t.minute, second=0, microsecond=0)
+        if target <= now:
+            target += timedelta(days=1)
+        if best is None or target < best:
+            best = target
+    return (best - now).total_seconds() if best is not None else None
+
+
 async def alarm_checker():
-    """Runs every 10 s — checks ALL alarms and fires matching ones."""
-    global alarm_fired_set
+    """Fires due alarms, then sleeps until the next one (or a list change).
+
+    Event-driven: instead of polling every 10 s, the task wakes only at the
+    next scheduled alarm minute or when add/delete signals `alarm_event`.
+    """
+    global alarm_fired_minute
     while True:
-        await asyncio.sleep(10)
-        if not alarms:
-            continue
-        now_12 = datetime.now().strftime("%I:%M %p")
-        for alarm in alarms:
-            fire_key = (alarm["id"], now_12)
-            if alarm["time"] == now_12 and fire_key not in alarm_fired_set:
-                alarm_fired_set.add(fire_key)
-                alarm_msg = json.dumps({
+        now = datetime.now()
+        now_12 = now.strftime("%I:%M %p")
+        if now_12 != alarm_fired_minute:
+            # Minute rolled over — all ids are stale, clear in O(1).
+            alarm_fired_minute = now_12
+            alarm_fired_ids.clear()
+        for alarm in alarms_by_time.get(now_12, ()):
+            if alarm["id"] not in alarm_fired_ids:
+                alarm_fired_ids.add(alarm["id"])
+                alarm_msg = orjson.dumps({
                     "type": "ALARM",
                     "medicine": alarm["medicine"],
                     "time": alarm["time"],
-                })
+                }).decode()
                 logger.info("⏰  ALARM: %s at %s — broadcasting", alarm["medicine"], now_12)
                 await manager.broadcast_to_frontends(alarm_msg)
                 await manager.broadcast_to_devices(alarm_msg)
-        # Clean up fired keys for times that no longer match
-        alarm_fired_set = {k for k in alarm_fired_set if k[1] == now_12}
+
+        try:
+            await asyncio.wait_for(
+                alarm_event.wait(), timeout=_seconds_to_next_alarm(now)
+            )
+        except asyncio.TimeoutError:
+            pass  # an alarm is due — loop around and fire it
+        else:
+            alarm_event.clear()  # reminder list changed — re-plan
 
 # ---------------------------------------------------------------------------
 # Lifespan (startup / shutdown)
@@ -208,15 +452,32 @@ async def alarm_checker():
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    open_db_pool()
     init_db()
-    task = asyncio.create_task(alarm_checker())
+    load_index()
+    alarm_task = asyncio.create_task(alarm_checker())
+    writer_task = asyncio.create_task(db_writer())
+    maintenance_task = asyncio.create_task(db_maintenance())
     yield
-    task.cancel()
+    alarm_task.cancel()
+    writer_task.cancel()
+    maintenance_task.cancel()
+    # Flush anything still queued so readings aren't lost on shutdown.
+    leftover = []
+    while not pending.empty():
+        leftover.append(pending.get_nowait())
+    if leftover:
+        await _flush_batch(leftover)
+    close_db_pool()
 
 # ---------------------------------------------------------------------------
 # Application
 # ---------------------------------------------------------------------------
-app = FastAPI(title="Smart Health Monitoring System", lifespan=lifespan)
+app = FastAPI(
+    title="Smart Health Monitoring System",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -229,6 +490,17 @@ app.add_middleware(
 # AI Health Risk Calculator
 # ---------------------------------------------------------------------------
 
+# Risk weights precomputed into lookup tables at import — scoring a frame
+# is two byte-table reads instead of a cascade of range branches.
+# HR: >120 → 40, >100 or <60 → 20. SpO2: <90 → 50, <95 → 30.
+_HR_RISK = bytes(
+    40 if hr > 120 else 20 if (hr > 100 or hr < 60) else 0 for hr in range(256)
+)
+_SPO2_RISK = bytes(
+    50 if s < 90 else 30 if s < 95 else 0 for s in range(101)
+)
+
+
 def calculate_health_risk(hr, spo2, temp):
     """
     Weighted rule-based risk scoring (simulated AI).
@@ -236,27 +508,16 @@ def calculate_health_risk(hr, spo2, temp):
     """
     risk = 0
 
-    # Heart Rate rules
     if hr is not None:
-        if hr > 120:
-            risk += 40
-        elif hr > 100 or hr < 60:
-            risk += 20
+        risk = _HR_RISK[min(max(int(hr), 0), 255)]
 
-    # SpO2 rules
     if spo2 is not None:
-        if spo2 < 90:
-            risk += 50
-        elif spo2 < 95:
-            risk += 30
+        risk += _SPO2_RISK[min(max(int(spo2), 0), 100)]
 
-    # Temperature rules
-    if temp is not None:
-        if temp > 37.5:
-            risk += 10
-
-    risk = min(risk, 100)
+    if temp is not None and temp > 37.5:
+        risk += 10
 
+    # Weights sum to at most 40 + 50 + 10 = 100, so no clamp needed.
     if risk >= 71:
         label = "Critical"
     elif risk >= 31:
@@ -271,42 +532,69 @@ def calculate_health_risk(hr, spo2, temp):
 # WebSocket Endpoint
 # ---------------------------------------------------------------------------
 
+_VALID_CLIENT_TYPES = frozenset({"device", "frontend"})
+
+
+async def _device_loop(websocket: WebSocket):
+    """Receive loop for device clients: save vitals and relay to frontends."""
+    while True:
+        # Devices send binary frames (skipping UTF-8 validation); accept
+        # text too for older senders. orjson parses either.
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code") or 1000)
+        data = message.get("bytes") or message.get("text")
+        try:
+            parsed = orjson.loads(data)
+            # Devices may coalesce backed-up readings into one frame.
+            readings = parsed.get("batch") or (parsed,)
+            for reading in readings:
+                # Guard: suppress fall events when fall detection is OFF
+                if not FALL_DETECTION_ENABLED and reading.get("fall_detected"):
+                    reading["fall_detected"] = False
+                    logger.info("Fall suppressed — detection disabled")
+
+                queue_vital(reading)
+        except Exception as e:
+            logger.error("DB save error: %s", e)
+            continue
+
+        # Nobody watching? Skip risk scoring and the re-encode entirely —
+        # the headless hot path is then just parse + enqueue.
+        if not manager.frontend_clients:
+            continue
+
+        for reading in readings:
+            # Inject AI health risk into the payload
+            risk_score, risk_label = calculate_health_risk(
+                reading.get("heart_rate"),
+                reading.get("spo2"),
+                reading.get("temp"),
+            )
+            reading["risk_score"] = risk_score
+            reading["risk_label"] = risk_label
+            # Broadcast to frontends (now includes risk data)
+            await manager.broadcast_to_frontends(orjson.dumps(reading).decode())
+
+
+async def _frontend_loop(websocket: WebSocket):
+    """Receive loop for frontend clients (inbound messages are just logged)."""
+    while True:
+        data = await websocket.receive_text()
+        logger.info("Message from frontend: %s", data)
+
+
 @app.websocket("/ws/{client_type}")
 async def websocket_endpoint(websocket: WebSocket, client_type: str):
-    if client_type not in ("device", "frontend"):
+    if client_type not in _VALID_CLIENT_TYPES:
         await websocket.close(code=1008, reason="Invalid client_type")
         return
 
     await manager.connect(websocket, client_type)
+    # Dispatch once per connection so the per-message loop is branch-free.
+    receive_loop = _device_loop if client_type == "device" else _frontend_loop
     try:
-        while True:
-            data = await websocket.receive_text()
-            if client_type == "device":
-                logger.info("Data from device → saving & broadcasting")
-                try:
-                    parsed = json.loads(data)
-                    # Guard: suppress fall events when fall detection is OFF
-                    if not FALL_DETECTION_ENABLED and parsed.get("fall_detected"):
-                        parsed["fall_detected"] = False
-                        logger.info("Fall suppressed — detection disabled")
-
-                    save_vital(parsed)
-
-                    # Inject AI health risk into the payload
-                    risk_score, risk_label = calculate_health_risk(
-                        parsed.get("heart_rate"),
-                        parsed.get("spo2"),
-                        parsed.get("temp"),
-                    )
-                    parsed["risk_score"] = risk_score
-                    parsed["risk_label"] = risk_label
-                    data = json.dumps(parsed)
-                except Exception as e:
-                    logger.error("DB save error: %s", e)
-                # Broadcast to frontends (now includes risk data)
-                await manager.broadcast_to_frontends(data)
-            else:
-                logger.info("Message from frontend: %s", data)
+        await receive_loop(websocket)
     except WebSocketDisconnect:
         manager.disconnect(websocket, client_type)
     except Exception as exc:
@@ -320,53 +608,60 @@ async def websocket_endpoint(websocket: WebSocket, client_type: str):
 @app.get("/history")
 async def get_history():
     """Return the last 50 vital readings (newest first)."""
-    rows = fetch_history(50)
-    return JSONResponse(content=rows)
+    # Run on a worker thread so the SELECT + row conversion never blocks
+    # the event loop (and the WebSocket broadcasts running on it).
+    rows = await asyncio.to_thread(fetch_history, 50)
+    return ORJSONResponse(content=rows)
+
+
+# One indexed pass in C: bucket rows by time slot and average inside SQLite
+# instead of filtering the raw rows per slot in Python. Slot math is pure
+# integer arithmetic on the epoch-ms column.
+SLOT_AGG_SQL = """
+    SELECT (ts_ms - ?) / ? AS slot,
+           AVG(heart_rate), AVG(spo2), AVG(temp),
+           SUM(fall_detected), COUNT(*)
+    FROM vital_logs
+    WHERE ts_ms >= ?
+    GROUP BY slot
+    ORDER BY slot
+"""
+
+
+def _fetch_slots(start_ms: int, slot_ms: int) -> list:
+    """Run the slot aggregation query (called via asyncio.to_thread)."""
+    with reader() as conn:
+        return conn.execute(SLOT_AGG_SQL, (start_ms, slot_ms, start_ms)).fetchall()
+
+
+def _round1(value):
+    return round(value, 1) if value is not None else None
 
 
 @app.get("/history-summary")
 async def get_history_summary():
     """Return up to 10 rows of 1-minute averaged data (last 10 minutes)."""
     now = datetime.now()
-    cutoff = (now - timedelta(minutes=10)).isoformat()
+    start = now - timedelta(minutes=10)
+    start_ms = int(start.timestamp() * 1000)
 
-    conn = get_db()
-    rows = conn.execute(
-        "SELECT * FROM vital_logs WHERE timestamp >= ? ORDER BY timestamp ASC",
-        (cutoff,),
-    ).fetchall()
-    conn.close()
-
-    raw = [dict(r) for r in rows]
-    if not raw:
-        return JSONResponse(content=[])
+    rows = await asyncio.to_thread(_fetch_slots, start_ms, 60_000)
 
     summary = []
-    for i in range(10):
-        bucket_start = now - timedelta(minutes=10) + timedelta(minutes=i)
-        bucket_end = bucket_start + timedelta(minutes=1)
-        start_iso = bucket_start.isoformat()
-        end_iso = bucket_end.isoformat()
-
-        bucket = [r for r in raw if start_iso <= r.get("timestamp", "") < end_iso]
-        if not bucket:
+    for slot, avg_hr, avg_spo2, avg_temp, falls, samples in rows:
+        if not 0 <= slot < 10:
             continue
-
-        hr_vals  = [r["heart_rate"] for r in bucket if r.get("heart_rate") is not None]
-        spo_vals = [r["spo2"]       for r in bucket if r.get("spo2") is not None]
-        tmp_vals = [r["temp"]       for r in bucket if r.get("temp") is not None]
-        falls    = sum(1 for r in bucket if r.get("fall_detected"))
-
+        bucket_start = start + timedelta(minutes=slot)
         summary.append({
             "timestamp": bucket_start.strftime("%I:%M %p"),
-            "heart_rate": round(sum(hr_vals) / len(hr_vals), 1) if hr_vals else None,
-            "spo2":       round(sum(spo_vals) / len(spo_vals), 1) if spo_vals else None,
-            "temp":       round(sum(tmp_vals) / len(tmp_vals), 1) if tmp_vals else None,
+            "heart_rate": _round1(avg_hr),
+            "spo2":       _round1(avg_spo2),
+            "temp":       _round1(avg_temp),
             "fall_detected": falls > 0,
-            "samples":    len(bucket),
+            "samples":    samples,
         })
 
-    return JSONResponse(content=summary)
+    return ORJSONResponse(content=summary)
 
 
 class FallToggleRequest(BaseModel):
@@ -397,53 +692,36 @@ async def get_report_data(duration: str = "1_day"):
         slots = 15
 
     now = datetime.now()
-    cutoff = (now - delta).isoformat()
+    window_start = now - delta
+    start_ms = int(window_start.timestamp() * 1000)
+    slot_secs = delta.total_seconds() / slots
+    slot_ms = int(slot_secs * 1000)
 
-    conn = get_db()
-    rows = conn.execute(
-        "SELECT * FROM vital_logs WHERE timestamp >= ? ORDER BY timestamp ASC",
-        (cutoff,),
-    ).fetchall()
-    conn.close()
-
-    raw = [dict(r) for r in rows]
-    total_raw = len(raw)
-
-    if total_raw == 0:
-        return JSONResponse(content={"slots": [], "total_raw": 0, "duration": duration})
+    rows = await asyncio.to_thread(_fetch_slots, start_ms, slot_ms)
 
     # Divide time range into equal slots and average
-    slot_duration = delta / slots
     aggregated = []
+    total_raw = 0
 
-    for i in range(slots):
-        slot_start = now - delta + (slot_duration * i)
-        slot_end = slot_start + slot_duration
-        start_iso = slot_start.isoformat()
-        end_iso = slot_end.isoformat()
-
-        bucket = [r for r in raw if start_iso <= r.get("timestamp", "") < end_iso]
-
-        if not bucket:
+    for slot, avg_hr, avg_spo2, avg_temp, falls, samples in rows:
+        if not 0 <= slot < slots:
             continue
-
-        hr_vals  = [r["heart_rate"] for r in bucket if r.get("heart_rate") is not None]
-        spo_vals = [r["spo2"]       for r in bucket if r.get("spo2") is not None]
-        tmp_vals = [r["temp"]       for r in bucket if r.get("temp") is not None]
-        falls    = sum(1 for r in bucket if r.get("fall_detected"))
+        total_raw += samples
+        slot_start = window_start + timedelta(seconds=slot_secs * slot)
+        slot_end = slot_start + timedelta(seconds=slot_secs)
 
         aggregated.append({
-            "slot":       i + 1,
+            "slot":       slot + 1,
             "time_start": slot_start.strftime("%I:%M:%S %p"),
             "time_end":   slot_end.strftime("%I:%M:%S %p"),
-            "avg_hr":     round(sum(hr_vals) / len(hr_vals), 1) if hr_vals else None,
-            "avg_spo2":   round(sum(spo_vals) / len(spo_vals), 1) if spo_vals else None,
-            "avg_temp":   round(sum(tmp_vals) / len(tmp_vals), 1) if tmp_vals else None,
+            "avg_hr":     _round1(avg_hr),
+            "avg_spo2":   _round1(avg_spo2),
+            "avg_temp":   _round1(avg_temp),
             "falls":      falls,
-            "samples":    len(bucket),
+            "samples":    samples,
         })
 
-    return JSONResponse(content={
+    return ORJSONResponse(content={
         "slots": aggregated,
         "total_raw": total_raw,
         "duration": duration,
@@ -456,9 +734,11 @@ async def add_reminder(req: AddReminderRequest):
     global next_alarm_id
     alarm = {"id": next_alarm_id, "time": req.time, "medicine": req.medicine}
     alarms.append(alarm)
+    alarms_by_time[req.time].append(alarm)
     next_alarm_id += 1
+    alarm_event.set()
     logger.info("Reminder added: %s at %s (id=%d)", req.medicine, req.time, alarm["id"])
-    sync_msg = json.dumps({"type": "SYNC_TIME", "payload": f"{req.medicine} at {req.time}"})
+    sync_msg = orjson.dumps({"type": "SYNC_TIME", "payload": f"{req.medicine} at {req.time}"}).decode()
     await manager.broadcast_to_devices(sync_msg)
     return {"status": "ok", "alarm": alarm}
 
@@ -468,6 +748,13 @@ async def delete_reminder(req: DeleteReminderRequest):
     """Remove a reminder by its ID."""
     global alarms
     alarms = [a for a in alarms if a["id"] != req.id]
+    for time_str in list(alarms_by_time):
+        remaining = [a for a in alarms_by_time[time_str] if a["id"] != req.id]
+        if remaining:
+            alarms_by_time[time_str] = remaining
+        else:
+            del alarms_by_time[time_str]
+    alarm_event.set()
     logger.info("Reminder deleted: id=%d", req.id)
     return {"status": "ok"}
 
@@ -475,7 +762,7 @@ async def delete_reminder(req: DeleteReminderRequest):
 @app.get("/reminders")
 async def get_reminders():
     """Return the current list of active reminders."""
-    return JSONResponse(content=alarms)
+    return ORJSONResponse(content=alarms)
 
 
 @app.post("/reset-alarm")
@@ -484,10 +771,9 @@ async def reset_alarm():
     Stop the emergency fall alarm on ALL connected clients
     (frontends + device buzzer).
     """
-    stop_msg = json.dumps({"type": "STOP_ALARM"})
     logger.info("🛑 Reset alarm — broadcasting STOP_ALARM to all clients")
-    await manager.broadcast_to_frontends(stop_msg)
-    await manager.broadcast_to_devices(stop_msg)
+    await manager.broadcast_to_frontends(STOP_ALARM_MSG)
+    await manager.broadcast_to_devices(STOP_ALARM_MSG)
     return {"status": "ok", "message": "Alarm stopped"}
 
 # ---------------------------------------------------------------------------
@@ -496,10 +782,28 @@ async def reset_alarm():
 
 FRONTEND_DIR = Path(__file__).resolve().parent.parent / "frontend"
 
+# index.html is read once at startup and served from memory — no disk
+# I/O on the root route. The ETag lets browsers revalidate for free.
+INDEX_BYTES: bytes = b""
+INDEX_ETAG: str = ""
+
+
+def load_index():
+    """Cache index.html bytes and its ETag (called once at startup)."""
+    global INDEX_BYTES, INDEX_ETAG
+    index_path = FRONTEND_DIR / "index.html"
+    stat = index_path.stat()
+    INDEX_BYTES = index_path.read_bytes()
+    INDEX_ETAG = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
 
 @app.get("/")
-async def serve_index():
-    return FileResponse(FRONTEND_DIR / "index.html")
+async def serve_index(request: Request):
+    if request.headers.get("if-none-match") == INDEX_ETAG:
+        return Response(status_code=304)
+    return Response(
+        INDEX_BYTES, media_type="text/html", headers={"ETag": INDEX_ETAG}
+    )
 
 
 app.mount("/", StaticFiles(directory=str(FRONTEND_DIR)), name="static")
@@ -6,13 +6,23 @@ and handling incoming server commands (SYNC_TIME, ALARM).
 """
 
 import asyncio
-import json
+import collections
+import logging
+import logging.handlers
+import os
+import queue
 import random
+import socket
 import sys
-from datetime import datetime
+import threading
+import time
+from urllib.parse import urlparse
 
+import orjson
 import websockets
 
+logger = logging.getLogger("mock-device")
+
 # ── Configuration ──────────────────────────────────────────
 USE_RENDER      = False                           # ← Set True to connect to Render deployment
 RENDER_APP_NAME = "health-monitor-system"         # Your Render app name
@@ -25,82 +35,403 @@ WS_URL = (
 DEVICE_ID = "PATIENT_001"
 INTERVAL  = 1  # seconds between readings
 
+# Send vitals over a dedicated synchronous WebSocket in a worker thread
+# instead of the asyncio socket. Skips the per-message coroutine
+# suspend/resume — useful for raw-throughput load tests. The async socket
+# then only carries inbound commands.
+USE_SYNC_SENDER = False
+
+
+# Reused payload dict — send_vitals serializes the result immediately and
+# never keeps a reference, so mutating one dict in place is safe and avoids
+# re-allocating six dict slots every tick.
+_PAYLOAD = {
+    "device_id":     DEVICE_ID,
+    "heart_rate":    0,
+    "spo2":          0,
+    "temp":          0.0,
+    "fall_detected": False,
+    "timestamp":     0,  # epoch nanoseconds
+}
+
+# One dedicated Random instance, its methods bound once so the hot loop
+# skips both the module and the instance attribute lookups per call.
+_RNG = random.Random()
+_randint     = _RNG.randint
+_random      = _RNG.random
+_getrandbits = _RNG.getrandbits
+_time_ns     = time.time_ns
+
+# Fall bits are pre-drawn 64 at a time into one machine word and consumed
+# 6 bits per tick: fall fires when all 6 are zero (P = 1/64 ≈ 1.6%,
+# close enough to the old 2% for a simulator). One getrandbits call
+# replaces ~10 float draws + compares.
+_fall_bits = 0
+_fall_cnt  = 0
+
+
+def _next_fall() -> bool:
+    global _fall_bits, _fall_cnt
+    if _fall_cnt < 6:
+        _fall_bits = _getrandbits(64)
+        _fall_cnt  = 64
+    fall = (_fall_bits & 0x3F) == 0
+    _fall_bits >>= 6
+    _fall_cnt  -= 6
+    return fall
+
 
 def generate_health_data() -> dict:
     """Return a realistic randomized health-data payload."""
-    return {
-        "device_id":     DEVICE_ID,
-        "heart_rate":    random.randint(60, 100),
-        "spo2":          random.randint(95, 100),
-        "temp":          round(random.uniform(36.0, 38.0), 1),
-        "fall_detected": random.random() < 0.02,
-        "timestamp":     datetime.now().isoformat(),
-    }
+    payload = _PAYLOAD
+    payload["heart_rate"]    = _randint(60, 100)
+    payload["spo2"]          = _randint(95, 100)
+    # One-decimal temp in [36.0, 38.0): one multiply + int cast instead of
+    # random.uniform plus a round() call.
+    payload["temp"]          = int(_random() * 20 + 360) / 10.0
+    payload["fall_detected"] = _next_fall()
+    # One clock read returning an int — no datetime object, no isoformat
+    # string; the server converts straight to its epoch-ms column.
+    payload["timestamp"]     = _time_ns()
+    return payload
+
+
+def _handle_sync(msg: dict):
+    print(f"\n📟 [OLED DISPLAY]: Next Pill Alarm set for --> {msg.get('payload')}")
+
+
+def _handle_alarm(msg: dict):
+    medicine = msg.get("medicine", "Unknown")
+    alarm_time = msg.get("time", "")
+    print(f"\n📟 [OLED DISPLAY]: 🔔 ALARM RANG! Take Medicine: {medicine}")
+    print(f"   ⏰ Scheduled Time: {alarm_time}")
+    print(f"   🔊 [BUZZER]: Beep! Beep! Beep!")
+
+
+def _handle_stop(msg: dict):
+    print(f"\n✅ [BUZZER OFF]: Patient confirmed safe — alarm stopped.")
+
+
+def _handle_unknown(msg: dict):
+    print(f"\n📩 [UNKNOWN MSG]: {msg}")
+
+
+# O(1) hashed dispatch instead of walking an if/elif chain of string
+# compares for every command.
+_HANDLERS = {
+    "SYNC_TIME":  _handle_sync,
+    "ALARM":      _handle_alarm,
+    "STOP_ALARM": _handle_stop,
+}
+
+
+# First character of a JSON document, covering both text frames (str,
+# indexes to a 1-char string) and binary frames (bytes, indexes to an int).
+_JSON_FIRST = frozenset(("{", "[", 0x7B, 0x5B))
 
 
 async def handle_incoming(ws):
     """Listen for commands from the server (runs concurrently)."""
+    # The server only sends well-formed JSON commands, so a first-byte
+    # check is enough to skip junk frames — no try/except frame set up
+    # on every iteration, and no traceback allocated for the bad ones.
     async for raw in ws:
-        try:
-            msg = json.loads(raw)
-        except json.JSONDecodeError:
+        if not raw or raw[0] not in _JSON_FIRST:
             continue
+        msg = orjson.loads(raw)
+        _HANDLERS.get(msg.get("type"), _handle_unknown)(msg)
 
-        msg_type = msg.get("type")
-        payload  = msg.get("payload")
-
-        if msg_type == "SYNC_TIME":
-            print(f"\n📟 [OLED DISPLAY]: Next Pill Alarm set for --> {payload}")
-        elif msg_type == "ALARM":
-            medicine = msg.get("medicine", "Unknown")
-            alarm_time = msg.get("time", "")
-            print(f"\n📟 [OLED DISPLAY]: 🔔 ALARM RANG! Take Medicine: {medicine}")
-            print(f"   ⏰ Scheduled Time: {alarm_time}")
-            print(f"   🔊 [BUZZER]: Beep! Beep! Beep!")
-        elif msg_type == "STOP_ALARM":
-            print(f"\n✅ [BUZZER OFF]: Patient confirmed safe — alarm stopped.")
-        else:
-            print(f"\n📩 [UNKNOWN MSG]: {msg}")
 
+# Outbound readings wait in a bounded deque: on overflow the *oldest*
+# reading is evicted for free, so a stalled link always resumes with the
+# freshest vitals and memory stays capped at OUTBOX_MAXLEN payloads.
+OUTBOX_MAXLEN = 256
+
+
+def start_vitals_ticker(
+    loop: asyncio.AbstractEventLoop,
+    outbox: collections.deque,
+    wakeup: asyncio.Event,
+):
+    """Generate one reading every INTERVAL seconds into the outbox.
+
+    Runs as a recurring timer callback instead of a coroutine looping on
+    `asyncio.sleep` — no suspend/resume per tick, and scheduling against
+    absolute loop time keeps the cadence drift-free. Returns a cancel
+    function for teardown on reconnect.
+    """
+    state = {"handle": None, "when": loop.time()}
+
+    def tick():
+        # Copy: a batched frame holds several readings at once, so they
+        # can't all alias the shared template dict.
+        payload = generate_health_data().copy()
+        outbox.append(payload)
+        wakeup.set()
+        # The guard skips the strftime and message formatting entirely
+        # when readings are silenced (MOCK_DEVICE_LOG_LEVEL=INFO).
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "[%s]  HR=%d  SpO2=%d  Temp=%.1f°C  Fall=%s",
+                time.strftime("%Y-%m-%d %H:%M:%S"),
+                payload["heart_rate"],
+                payload["spo2"],
+                payload["temp"],
+                "YES" if payload["fall_detected"] else "No",
+            )
+        state["when"] += INTERVAL
+        state["handle"] = loop.call_at(state["when"], tick)
+
+    tick()
+
+    def cancel():
+        if state["handle"] is not None:
+            state["handle"].cancel()
 
-async def send_vitals(ws):
-    """Send vital signs every INTERVAL seconds."""
+    return cancel
+
+
+# The payload schema is fixed, so frames are built by splicing values into
+# a pre-encoded byte template — one bytes-format call, no per-field JSON
+# dispatch. Fall back to orjson.dumps if the schema ever changes.
+_FRAME_TEMPLATE = ('{"device_id":"%s",' % DEVICE_ID).encode() + (
+    b'"heart_rate":%d,"spo2":%d,"temp":%.1f,'
+    b'"fall_detected":%s,"timestamp":%d}'
+)
+
+
+def encode_reading(payload: dict) -> bytes:
+    """Serialize one reading through the byte template."""
+    return _FRAME_TEMPLATE % (
+        payload["heart_rate"],
+        payload["spo2"],
+        payload["temp"],
+        b"true" if payload["fall_detected"] else b"false",
+        payload["timestamp"],
+    )
+
+
+async def send_vitals(ws, outbox: collections.deque, wakeup: asyncio.Event):
+    """Drain the outbox, coalescing backed-up readings into one WS frame."""
     while True:
-        payload = generate_health_data()
-        await ws.send(json.dumps(payload))
-        ts = payload["timestamp"]
-        print(
-            f"[{ts}]  HR={payload['heart_rate']}  "
-            f"SpO2={payload['spo2']}  "
-            f"Temp={payload['temp']}°C  "
-            f"Fall={'YES' if payload['fall_detected'] else 'No'}"
-        )
-        await asyncio.sleep(INTERVAL)
+        await wakeup.wait()
+        wakeup.clear()
+        if not outbox:
+            continue
+        batch = list(outbox)
+        outbox.clear()
+        if len(batch) == 1:
+            frame = encode_reading(batch[0])
+        else:
+            frame = b'{"batch":[%s]}' % b",".join(map(encode_reading, batch))
+        # Sending bytes produces a binary frame: no UTF-8 encode here and
+        # no UTF-8 validation pass inside the websockets library.
+        await ws.send(frame)
+
+
+def sync_sender(stop: threading.Event):
+    """Send vitals on a plain sync WebSocket (runs on a worker thread).
+
+    No event loop in the hot path: each tick is generate → encode →
+    blocking send → sleep. Reconnects with a short backoff.
+    """
+    from websockets.sync.client import connect as sync_connect
+
+    while not stop.is_set():
+        try:
+            with sync_connect(WS_URL, compression=None) as ws:
+                print("[MOCK DEVICE] Sync sender connected  ✓")
+                while not stop.is_set():
+                    ws.send(encode_reading(generate_health_data()))
+                    time.sleep(INTERVAL)
+        except Exception:
+            if not stop.is_set():
+                time.sleep(1)  # server gone — retry shortly
+
+
+# DNS for the server is resolved once per process; every reconnect
+# reuses the cached address instead of re-querying the resolver.
+_addrinfo_cache = None
+
+
+async def _open_socket(loop: asyncio.AbstractEventLoop) -> socket.socket:
+    """Open a TCP socket to the server from the cached DNS resolution."""
+    global _addrinfo_cache
+    if _addrinfo_cache is None:
+        parsed = urlparse(WS_URL)
+        port = parsed.port or (443 if parsed.scheme == "wss" else 80)
+        _addrinfo_cache = socket.getaddrinfo(
+            parsed.hostname, port, type=socket.SOCK_STREAM
+        )[0]
+    family, sock_type, proto, _, sockaddr = _addrinfo_cache
+    sock = socket.socket(family, sock_type, proto)
+    sock.setblocking(False)
+    try:
+        await loop.sock_connect(sock, sockaddr)
+    except Exception:
+        sock.close()
+        raise
+    return sock
 
 
 async def stream():
-    """Connect to the server and run send + receive concurrently."""
+    """Connect to the server and run send + receive concurrently.
+
+    Reconnects with exponential backoff plus jitter so a down server
+    isn't hammered by a tight retry loop.
+    """
     print(f"[MOCK DEVICE] Connecting to {WS_URL} ...")
 
-    async for ws in websockets.connect(WS_URL):
+    loop = asyncio.get_running_loop()
+
+    sync_stop = threading.Event()
+    if USE_SYNC_SENDER:
+        threading.Thread(
+            target=sync_sender, args=(sync_stop,), daemon=True
+        ).start()
+
+    attempt = 0
+    while True:
+        # compression=None: permessage-deflate is pure CPU overhead on this
+        # point-to-point link. write_limit raises the drain threshold so
+        # small frames don't await flow control; max_size=None lifts the
+        # 1 MiB read cap that large batched frames could hit.
         try:
-            print(f"[MOCK DEVICE] Connected as '{DEVICE_ID}'  ✓")
-            # Run sender and receiver in parallel
-            await asyncio.gather(
-                send_vitals(ws),
-                handle_incoming(ws),
+            sock = await _open_socket(loop)
+            ws = await websockets.connect(
+                WS_URL,
+                sock=sock,
+                open_timeout=2,
+                close_timeout=1,
+                compression=None,
+                max_size=None,
+                write_limit=2 ** 20,
+                ping_interval=20,
             )
+        except KeyboardInterrupt:
+            print("\n[MOCK DEVICE] Shutting down.")
+            break
+        except Exception:
+            attempt += 1
+            delay = min(30.0, 0.5 * 2 ** attempt + _random())
+            print(f"[MOCK DEVICE] Connect failed — retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            continue
+
+        attempt = 0
+        print(f"[MOCK DEVICE] Connected as '{DEVICE_ID}'  ✓")
+        cancel_ticker = None
+        try:
+            if USE_SYNC_SENDER:
+                # Outbound runs on the sync thread; this socket only
+                # listens for commands.
+                await handle_incoming(ws)
+            else:
+                outbox: collections.deque = collections.deque(
+                    maxlen=OUTBOX_MAXLEN
+                )
+                wakeup = asyncio.Event()
+                cancel_ticker = start_vitals_ticker(loop, outbox, wakeup)
+                # Run sender and receiver in parallel
+                await asyncio.gather(
+                    send_vitals(ws, outbox, wakeup),
+                    handle_incoming(ws),
+                )
         except websockets.ConnectionClosed:
             print("[MOCK DEVICE] Connection lost – reconnecting …")
             continue
         except KeyboardInterrupt:
             print("\n[MOCK DEVICE] Shutting down.")
             break
+        finally:
+            if cancel_ticker is not None:
+                cancel_ticker()
+            await ws.close()
+
+    sync_stop.set()
+
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """Route the reading log through a background thread.
+
+    A QueueHandler makes the hot-loop log call a plain put; formatting
+    and the (blocking) stdout write happen on the listener thread, never
+    on the event loop. Set MOCK_DEVICE_LOG_LEVEL=INFO to silence the
+    per-tick readings during load tests.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter("%(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, console)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(os.environ.get("MOCK_DEVICE_LOG_LEVEL", "DEBUG"))
+    listener.start()
+    return listener
+
+
+async def stream_many(n: int):
+    """Load-test mode: simulate `n` patients from one process.
+
+    Each tick draws all patients' vitals with a handful of vectorized
+    NumPy ops and fans the frames out over n WebSocket connections, so
+    the per-patient interpreter cost is just one bytes-format and one
+    send instead of individual random/dict work per patient.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        raise SystemExit("stream_many requires numpy: pip install numpy")
+
+    template = ('{"device_id":"%s_%%03d",' % DEVICE_ID).encode() + (
+        b'"heart_rate":%d,"spo2":%d,"temp":%.1f,'
+        b'"fall_detected":%s,"timestamp":%d}'
+    )
+    rng = np.random.default_rng()
+
+    print(f"[MOCK DEVICE] Connecting {n} simulated patients to {WS_URL} ...")
+    conns = [
+        await websockets.connect(WS_URL, compression=None, write_limit=2 ** 20)
+        for _ in range(n)
+    ]
+    print(f"[MOCK DEVICE] {n} patients connected  ✓")
+
+    try:
+        while True:
+            hr   = rng.integers(60, 101, size=n).tolist()
+            spo2 = rng.integers(95, 101, size=n).tolist()
+            temp = (rng.integers(360, 380, size=n) / 10.0).tolist()
+            fall = (rng.random(n) < 0.02).tolist()
+            ts   = time.time_ns()
+            await asyncio.gather(*(
+                ws.send(template % (
+                    i + 1, hr[i], spo2[i], temp[i],
+                    b"true" if fall[i] else b"false", ts,
+                ))
+                for i, ws in enumerate(conns)
+            ))
+            await asyncio.sleep(INTERVAL)
+    finally:
+        await asyncio.gather(
+            *(ws.close() for ws in conns), return_exceptions=True
+        )
 
 
 if __name__ == "__main__":
+    listener = setup_logging()
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass  # uvloop is Unix-only; the default loop works fine on Windows
+
     try:
-        asyncio.run(stream())
+        # `python mock_device.py 50` load-tests with 50 simulated patients.
+        if len(sys.argv) > 1:
+            asyncio.run(stream_many(int(sys.argv[1])))
+        else:
+            asyncio.run(stream())
     except KeyboardInterrupt:
         print("\n[MOCK DEVICE] Stopped.")
         sys.exit(0)
+    finally:
+        listener.stop()